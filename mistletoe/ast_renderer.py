@@ -35,13 +35,14 @@ def get_ast(token):
     #   [1]: https://docs.python.org/3/whatsnew/3.6.html
     #   [2]: https://github.com/syntax-tree/mdast
     node['type'] = token.__class__.__name__
+    token_attrs = vars(token)
     for attrname in ['content', 'footnotes']:
-        if attrname in vars(token):
-            node[attrname] = getattr(token, attrname)
+        if attrname in token_attrs:
+            node[attrname] = token_attrs[attrname]
     for attrname in token.repr_attributes:
         node[attrname] = getattr(token, attrname)
-    if 'header' in vars(token):
-        node['header'] = get_ast(getattr(token, 'header'))
+    if 'header' in token_attrs:
+        node['header'] = get_ast(token_attrs['header'])
     if token.children is not None:
         node['children'] = [get_ast(child) for child in token.children]
     return node
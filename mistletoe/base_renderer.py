@@ -126,8 +126,14 @@ class BaseRenderer(object):
 
     @classmethod
     def _cls_to_func(cls, cls_name):
-        snake = '_'.join(map(str.lower, cls._parse_name.findall(cls_name)))
-        return 'render_{}'.format(snake)
+        # note: the names are cached, since renderers are often constructed
+        # once per document, with the same custom tokens every time.
+        key = (cls._parse_name, cls_name)
+        func_name = _func_names.get(key)
+        if func_name is None:
+            snake = '_'.join(map(str.lower, cls._parse_name.findall(cls_name)))
+            func_name = _func_names[key] = 'render_{}'.format(snake)
+        return func_name
 
     @staticmethod
     def _tokens_from_module(module):
@@ -209,3 +215,7 @@ class BaseRenderer(object):
 # reserved characters as per [RFC 3986](https://www.rfc-editor.org/rfc/rfc3986#section-2.2).
 # Plus we add the percent character (%) to avoid double-escaping.
 URI_SAFE_CHARACTERS = ":/?#[]@!$&'()*+,;=%"
+
+# Render function names by name parsing pattern and token class name,
+# as resolved by `BaseRenderer._cls_to_func`.
+_func_names = {}
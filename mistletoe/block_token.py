@@ -152,7 +152,7 @@ class Document(BlockToken):
         """
         if isinstance(lines, str):
             lines = lines.splitlines(keepends=True)
-        lines = [line if line.endswith('\n') else '{}\n'.format(line) for line in lines]
+        lines = [line if line.endswith('\n') else line + '\n' for line in lines]
         self.footnotes = {}
         self.line_number = 1
         token._root_node = self
@@ -5,6 +5,9 @@ from argparse import ArgumentParser
 
 version_str = 'mistletoe [version {}]'.format(mistletoe.__version__)
 
+# number of characters encoded and written to stdout at a time.
+_write_chunk_size = 1 << 16
+
 
 def main(args):
     namespace = parse(args)
@@ -26,11 +29,20 @@ def convert_file(filename, renderer):
     try:
         with open(filename, 'r', encoding='utf-8') as fin:
             rendered = mistletoe.markdown(fin, renderer)
-            sys.stdout.buffer.write(rendered.encode())
+            _write_encoded(rendered)
     except OSError:
         sys.exit('Cannot open file "{}".'.format(filename))
 
 
+def _write_encoded(text):
+    """
+    Writes text to stdout as UTF-8, a chunk at a time, so that an encoded
+    copy of the entire output is never held in memory.
+    """
+    for start in range(0, len(text), _write_chunk_size):
+        sys.stdout.buffer.write(text[start:start + _write_chunk_size].encode())
+
+
 def interactive(renderer):
     """
     Parse user input, dump to stdout, rinse and repeat.
@@ -73,32 +73,31 @@ class HtmlRenderer(BaseRenderer):
         return template.format(self.render_inner(token))
 
     def render_image(self, token: span_token.Image) -> str:
-        template = '<img src="{}" alt="{}"{} />'
+        # note: links and images are built by joining their parts, rather than
+        # with `str.format`, since they can be numerous in a document.
         src = self.escape_url(token.src)
         if token.title:
-            title = ' title="{}"'.format(html.escape(token.title))
+            title = ''.join((' title="', html.escape(token.title), '"'))
         else:
             title = ''
-        return template.format(src, self.render_to_plain(token), title)
+        return ''.join(('<img src="', src, '" alt="', self.render_to_plain(token), '"', title, ' />'))
 
     def render_link(self, token: span_token.Link) -> str:
-        template = '<a href="{target}"{title}>{inner}</a>'
         target = self.escape_url(token.target)
         if token.title:
-            title = ' title="{}"'.format(html.escape(token.title))
+            title = ''.join((' title="', html.escape(token.title), '"'))
         else:
             title = ''
         inner = self.render_inner(token)
-        return template.format(target=target, title=title, inner=inner)
+        return ''.join(('<a href="', target, '"', title, '>', inner, '</a>'))
 
     def render_auto_link(self, token: span_token.AutoLink) -> str:
-        template = '<a href="{target}">{inner}</a>'
         if token.mailto:
-            target = 'mailto:{}'.format(token.target)
+            target = 'mailto:' + token.target
         else:
             target = self.escape_url(token.target)
         inner = self.render_inner(token)
-        return template.format(target=target, inner=inner)
+        return ''.join(('<a href="', target, '">', inner, '</a>'))
 
     def render_escape_sequence(self, token: span_token.EscapeSequence) -> str:
         return self.render_inner(token)
@@ -3,13 +3,20 @@ Markdown renderer for mistletoe.
 """
 
 import re
-from itertools import chain
+from itertools import chain, repeat, zip_longest
 from typing import Iterable, Optional, Sequence
 
 from mistletoe import block_token, span_token, token
 from mistletoe.base_renderer import BaseRenderer
 
 
+# opening sequences of atx headings, indexed by heading level.
+_HEADING_MARKERS = tuple("#" * level for level in range(7))
+
+# delimiters of strong emphasis, by emphasis delimiter character.
+_STRONG_DELIMITERS = {"*": "**", "_": "__"}
+
+
 class BlankLine(block_token.BlockToken):
     """
     Blank line token. Represents a single blank line.
@@ -23,7 +30,8 @@ class BlankLine(block_token.BlockToken):
 
     @classmethod
     def start(cls, line):
-        return cls.pattern.match(line)
+        # equivalent to `cls.pattern.match(line)`, but without going through the regex engine.
+        return line.endswith("\n") and line.isspace()
 
     @classmethod
     def read(cls, lines):
@@ -73,11 +81,39 @@ class Fragment:
 
     Attributes:
         text (str): markdown fragment.
+        wordwrap (bool): whether the text may be word wrapped (default to False).
+        hard_line_break (bool): whether the fragment is a hard line break (default to False).
     """
 
-    def __init__(self, text: str, **extras):
+    # note: `__dict__` is kept as a slot, so that fragments can still carry additional data.
+    # it is only allocated when there is any.
+    __slots__ = ("text", "wordwrap", "hard_line_break", "__dict__")
+
+    def __init__(
+        self, text: str, wordwrap: bool = False, hard_line_break: bool = False, **extras
+    ):
         self.text = text
-        self.__dict__.update(extras)
+        self.wordwrap = wordwrap
+        self.hard_line_break = hard_line_break
+        if extras:
+            self.__dict__.update(extras)
+
+
+class _RenderDispatch(dict):
+    """
+    Maps token classes to render functions. The functions are looked up by class name
+    in the renderer's current `render_map` on first use, and cached by class from then on.
+    The cache is cleared by the renderer at the start of each top-level `render` call,
+    so that changes to `render_map` take effect from the next rendering on.
+    """
+
+    def __init__(self, renderer):
+        super().__init__()
+        self.renderer = renderer
+
+    def __missing__(self, token_type):
+        render_func = self[token_type] = self.renderer.render_map[token_type.__name__]
+        return render_func
 
 
 class MarkdownRenderer(BaseRenderer):
@@ -90,7 +126,7 @@ class MarkdownRenderer(BaseRenderer):
     Includes `HtmlBlock` and `HtmlSpan` tokens in the parsing.
     """
 
-    _whitespace = re.compile(r"\s+")
+    _title_closers = {"(": ")"}
 
     def __init__(
         self,
@@ -111,21 +147,18 @@ class MarkdownRenderer(BaseRenderer):
         """
         block_token.remove_token(block_token.Footnote)
         super().__init__(
-            *chain(
-                (
-                    block_token.HtmlBlock,
-                    span_token.HtmlSpan,
-                    BlankLine,
-                    LinkReferenceDefinitionBlock,
-                ),
-                extras,
-            )
+            block_token.HtmlBlock,
+            span_token.HtmlSpan,
+            BlankLine,
+            LinkReferenceDefinitionBlock,
+            *extras
         )
         self.render_map["SetextHeading"] = self.render_setext_heading
         self.render_map["CodeFence"] = self.render_fenced_code_block
         self.render_map[
             "LinkReferenceDefinition"
         ] = self.render_link_reference_definition
+        self._dispatch = _RenderDispatch(self)
         self.max_line_length = max_line_length
         self.normalize_whitespace = normalize_whitespace
 
@@ -133,23 +166,27 @@ class MarkdownRenderer(BaseRenderer):
         """
         Renders the tree of tokens rooted at the given token into markdown.
         """
+        self._dispatch.clear()
         if isinstance(token, block_token.BlockToken):
-            lines = self.render_map[token.__class__.__name__](
+            lines = self._dispatch[type(token)](
                 token, max_line_length=self.max_line_length
             )
         else:
             lines = self.span_to_lines([token], max_line_length=self.max_line_length)
 
-        return "".join(map(lambda line: line + "\n", lines))
+        # a single join over a materialized list is much cheaper than
+        # appending the line terminator to each line separately.
+        lines = list(lines)
+        return "\n".join(lines) + "\n" if lines else ""
 
     # rendering of span/inline tokens.
     # rendered into sequences of Fragments.
 
     def render_raw_text(self, token) -> Iterable[Fragment]:
-        yield Fragment(token.content, wordwrap=True)
+        return [Fragment(token.content, wordwrap=True)]
 
     def render_strong(self, token: span_token.Strong) -> Iterable[Fragment]:
-        return self.embed_span(Fragment(token.delimiter * 2), token.children)
+        return self.embed_span(Fragment(_STRONG_DELIMITERS[token.delimiter]), token.children)
 
     def render_emphasis(self, token: span_token.Emphasis) -> Iterable[Fragment]:
         return self.embed_span(Fragment(token.delimiter), token.children)
@@ -167,65 +204,63 @@ class MarkdownRenderer(BaseRenderer):
         return self.embed_span(Fragment("~~"), token.children)
 
     def render_image(self, token: span_token.Image) -> Iterable[Fragment]:
-        yield Fragment("!")
-        yield from self.render_link_or_image(token, token.src)
+        fragments = [Fragment("!")]
+        fragments.extend(self.render_link_or_image(token, token.src))
+        return fragments
 
     def render_link(self, token: span_token.Link) -> Iterable[Fragment]:
         return self.render_link_or_image(token, token.target)
 
     def render_link_or_image(
         self, token: span_token.SpanToken, target: str
-    ) -> Iterable[Fragment]:
-        yield from self.embed_span(
+    ) -> Sequence[Fragment]:
+        fragments = self.embed_span(
             Fragment("["),
             token.children,
             Fragment("]"),
         )
 
-        if token.dest_type == "uri" or token.dest_type == "angle_uri":
+        dest_type = token.dest_type
+        if dest_type == "uri" or dest_type == "angle_uri":
             # "[" description "](" dest_part [" " title] ")"
-            yield Fragment("(")
-            dest_part = "<" + target + ">" if token.dest_type == "angle_uri" else target
-            yield Fragment(dest_part)
+            dest_part = "<" + target + ">" if dest_type == "angle_uri" else target
+            fragments.append(Fragment("("))
+            fragments.append(Fragment(dest_part))
             if token.title:
-                yield from (
-                    Fragment(" ", wordwrap=True),
-                    Fragment(token.title_delimiter),
-                    Fragment(token.title, wordwrap=True),
-                    Fragment(
-                        ")" if token.title_delimiter == "(" else token.title_delimiter,
-                    ),
-                )
-            yield Fragment(")")
-        elif token.dest_type == "full":
+                fragments.extend(self.title_fragments(token.title, token.title_delimiter))
+            fragments.append(Fragment(")"))
+        elif dest_type == "full":
             # "[" description "][" label "]"
-            yield from (
+            fragments.extend((
                 Fragment("["),
                 Fragment(token.label, wordwrap=True),
                 Fragment("]"),
-            )
-        elif token.dest_type == "collapsed":
+            ))
+        elif dest_type == "collapsed":
             # "[" description "][]"
-            yield Fragment("[]")
+            fragments.append(Fragment("[]"))
         else:
             # "[" description "]"
             pass
+        return fragments
 
     def render_auto_link(self, token: span_token.AutoLink) -> Iterable[Fragment]:
-        yield Fragment("<" + token.children[0].content + ">")
+        return [Fragment("<" + token.children[0].content + ">")]
 
     def render_escape_sequence(
         self, token: span_token.EscapeSequence
     ) -> Iterable[Fragment]:
-        yield Fragment("\\" + token.children[0].content)
+        return [Fragment("\\" + token.children[0].content)]
 
     def render_line_break(self, token: span_token.LineBreak) -> Iterable[Fragment]:
-        yield Fragment(
-            token.content + "\n", wordwrap=token.soft, hard_line_break=not token.soft
-        )
+        return [
+            Fragment(
+                token.content + "\n", wordwrap=token.soft, hard_line_break=not token.soft
+            )
+        ]
 
     def render_html_span(self, token: span_token.HtmlSpan) -> Iterable[Fragment]:
-        yield Fragment(token.content)
+        return [Fragment(token.content)]
 
     def render_link_reference_definition(
         self, token: LinkReferenceDefinition
@@ -241,14 +276,7 @@ class MarkdownRenderer(BaseRenderer):
             ),
         )
         if token.title:
-            yield from (
-                Fragment(" ", wordwrap=True),
-                Fragment(token.title_delimiter),
-                Fragment(token.title, wordwrap=True),
-                Fragment(
-                    ")" if token.title_delimiter == "(" else token.title_delimiter,
-                ),
-            )
+            yield from self.title_fragments(token.title, token.title_delimiter)
 
     # rendering of block tokens.
     # rendered into sequences of lines (strings), to be joined by newlines.
@@ -262,8 +290,8 @@ class MarkdownRenderer(BaseRenderer):
         self, token: block_token.Heading, max_line_length: Optional[int]
     ) -> Iterable[str]:
         # note: no word wrapping, because atx headings always fit on a single line.
-        line = "#" * token.level
-        text = next(self.span_to_lines(token.children, max_line_length=None), "")
+        line = _HEADING_MARKERS[token.level]
+        text = self.span_to_line(token.children)
         if text:
             line += " " + text
         if token.closing_sequence:
@@ -293,18 +321,17 @@ class MarkdownRenderer(BaseRenderer):
     def render_block_code(
         self, token: block_token.BlockCode, max_line_length: Optional[int]
     ) -> Iterable[str]:
-        lines = token.content[:-1].split("\n")
-        return self.prefix_lines(lines, "    ")
+        return self.prefix_lines(self.split_code_lines(token.content), "    ")
 
     def render_fenced_code_block(
         self, token: block_token.BlockCode, max_line_length: Optional[int]
     ) -> Iterable[str]:
         indentation = " " * token.indentation
-        yield indentation + token.delimiter + token.info_string
-        yield from self.prefix_lines(
-            token.content[:-1].split("\n"), indentation
-        )
-        yield indentation + token.delimiter
+        fence = indentation + token.delimiter
+        lines = [fence + token.info_string]
+        lines.extend(self.prefix_lines(self.split_code_lines(token.content), indentation))
+        lines.append(fence)
+        return lines
 
     def render_list(
         self, token: block_token.List, max_line_length: Optional[int]
@@ -327,7 +354,7 @@ class MarkdownRenderer(BaseRenderer):
             token.children, max_line_length=max_child_line_length
         )
         return self.prefix_lines(
-            list(lines) or [""],
+            lines or [""],
             " " * indentation + token.leader + " " * (prepend - len(token.leader) - indentation),
             " " * prepend,
         )
@@ -340,10 +367,8 @@ class MarkdownRenderer(BaseRenderer):
         content.extend(self.table_row_to_text(row) for row in token.children)
         col_widths = self.calculate_table_column_widths(content)
         content[1] = self.table_separator_line_to_text(col_widths, token.column_align)
-        return [
-            self.table_row_to_line(col_text, col_widths, token.column_align)
-            for col_text in content
-        ]
+        col_padders = self.table_column_padders(col_widths, token.column_align)
+        return [self.pad_table_row(col_text, col_padders) for col_text in content]
 
     def render_thematic_break(
         self, token: block_token.ThematicBreak, max_line_length: Optional[int]
@@ -369,6 +394,18 @@ class MarkdownRenderer(BaseRenderer):
 
     # helper methods
 
+    @classmethod
+    def title_fragments(cls, title: str, title_delimiter: str) -> Sequence[Fragment]:
+        """
+        Makes fragments for a link title, including the space before it.
+        """
+        return [
+            Fragment(" ", wordwrap=True),
+            Fragment(title_delimiter),
+            Fragment(title, wordwrap=True),
+            Fragment(cls._title_closers.get(title_delimiter, title_delimiter)),
+        ]
+
     def embed_span(
         self,
         leader: Fragment,
@@ -379,85 +416,113 @@ class MarkdownRenderer(BaseRenderer):
         Makes fragments from `tokens` and embeds within a leader and a trailer.
         The trailer defaults to the same as the leader.
         """
-        yield leader
-        yield from self.make_fragments(tokens)
-        yield trailer or leader
+        fragments = [leader]
+        fragments.extend(self.make_fragments(tokens))
+        fragments.append(leader if trailer is None else trailer)
+        return fragments
+
+    @staticmethod
+    def split_code_lines(content: str) -> Sequence[str]:
+        """
+        Splits the content of a code block into lines.
+        Only `\n` is a line separator; other characters such as form feeds are kept as they are.
+        """
+        lines = content.split("\n")
+        if not lines[-1]:
+            # the content normally ends with a newline, which doesn't start another line.
+            lines.pop()
+        return lines
 
     def blocks_to_lines(
         self, tokens: Iterable[block_token.BlockToken], max_line_length: Optional[int]
-    ) -> Iterable[str]:
+    ) -> Sequence[str]:
         """
-        Renders a sequence of block tokens into a sequence of lines.
+        Renders a sequence of block tokens into a list of lines.
         """
+        lines = []
+        extend = lines.extend
+        dispatch = self._dispatch
         for token in tokens:  # noqa: F402
-            yield from self.render_map[token.__class__.__name__](
-                token, max_line_length=max_line_length
-            )
+            extend(dispatch[type(token)](token, max_line_length=max_line_length))
+        return lines
 
     def span_to_lines(
         self, tokens: Iterable[span_token.SpanToken], max_line_length: Optional[int]
-    ) -> Iterable[str]:
+    ) -> Sequence[str]:
         """
-        Renders a sequence of span (inline) tokens into a sequence of lines.
+        Renders a sequence of span (inline) tokens into a list of lines.
         """
         fragments = self.make_fragments(tokens)
         return self.fragments_to_lines(fragments, max_line_length=max_line_length)
 
+    def span_to_line(self, tokens: Iterable[span_token.SpanToken]) -> str:
+        """
+        Renders a sequence of span (inline) tokens into a single line, without word wrapping.
+        Only the first line is kept, should the rendered text contain line breaks.
+        """
+        text = "".join([fragment.text for fragment in self.make_fragments(tokens)])
+        return text.partition("\n")[0]
+
     def make_fragments(self, tokens: Iterable[span_token.SpanToken]
     ) -> Iterable[Fragment]:
         """
         Renders a sequence of span (inline) tokens into a sequence of Fragments.
         """
-        return chain.from_iterable(
-            [self.render_map[token.__class__.__name__](token) for token in tokens]
-        )
+        fragments = []
+        extend = fragments.extend
+        dispatch = self._dispatch
+        for token in tokens:  # noqa: F402
+            extend(dispatch[type(token)](token))
+        return fragments
 
     @classmethod
     def fragments_to_lines(
         cls, fragments: Iterable[Fragment], max_line_length: Optional[int] = None
-    ) -> Iterable[str]:
+    ) -> Sequence[str]:
         """
         Renders a sequence of Fragments into lines.
         With word wrapping, if a `max_line_length` is given, or else following the
         original text flow as closely as possible.
         """
-        current_line = ""
         if not max_line_length:
             # plain rendering: merge all fragments and split on newlines
-            for fragment in fragments:
-                if "\n" in fragment.text:
-                    lines = fragment.text.split("\n")
-                    yield current_line + lines[0]
-                    for inner_line in lines[1:-1]:
-                        yield inner_line
-                    current_line = lines[-1]
-                else:
-                    current_line += fragment.text
-        else:
-            # render with word wrapping
-            for word in cls.make_words(fragments):
-                if word == "\n":
-                    # hard line break
-                    yield current_line
-                    current_line = ""
-                    continue
-
-                if not current_line:
-                    # first word on an empty line: accept and continue
-                    current_line = word
-                    continue
-
-                # try to fit the word on the current line.
-                # if it doesn't fit, flush the line and start on the next
-                test = current_line + " " + word
-                if len(test) <= max_line_length:
-                    current_line = test
-                else:
-                    yield current_line
-                    current_line = word
-
-        if current_line:
-            yield current_line
+            lines = "".join([fragment.text for fragment in fragments]).split("\n")
+            if not lines[-1]:
+                lines.pop()
+            return lines
+
+        # render with word wrapping.
+        # the words on the current line are collected and joined when the line is complete.
+        lines = []
+        line_words = []
+        line_length = 0
+        for word in cls.make_words(fragments):
+            if word == "\n":
+                # hard line break
+                lines.append(" ".join(line_words))
+                line_words = []
+                line_length = 0
+                continue
+
+            if not line_words:
+                # first word on an empty line: accept and continue
+                line_words.append(word)
+                line_length = len(word)
+                continue
+
+            # try to fit the word on the current line.
+            # if it doesn't fit, flush the line and start on the next
+            line_length += 1 + len(word)
+            if line_length <= max_line_length:
+                line_words.append(word)
+            else:
+                lines.append(" ".join(line_words))
+                line_words = [word]
+                line_length = len(word)
+
+        if line_words:
+            lines.append(" ".join(line_words))
+        return lines
 
     @classmethod
     def make_words(cls, fragments: Iterable[Fragment]) -> Iterable[str]:
@@ -466,53 +531,77 @@ class MarkdownRenderer(BaseRenderer):
         which do not contain breakable spaces or line breaks. The exception is
         hard line breaks, which are represented by the string `\n`.
         """
-        word = ""
+        # the parts of the current word are collected and joined once the word is complete.
+        word_parts = []
         for fragment in fragments:
-            if getattr(fragment, "wordwrap", False):
-                first = True
-                for item in cls._whitespace.split(fragment.text):
-                    if first:
-                        word += item
-                        first = False
-                    else:
-                        if word:
-                            yield word
-                        word = item
-            elif getattr(fragment, "hard_line_break", False):
-                yield from (word + fragment.text[:-1], "\n")
-                word = ""
+            if fragment.wordwrap:
+                items = cls.split_on_whitespace(fragment.text)
+                word_parts.append(items[0])
+                for item in items[1:]:
+                    word = "".join(word_parts)
+                    if word:
+                        yield word
+                    word_parts = [item]
+            elif fragment.hard_line_break:
+                word_parts.append(fragment.text[:-1])
+                yield "".join(word_parts)
+                yield "\n"
+                word_parts = []
             else:
-                word += fragment.text
+                word_parts.append(fragment.text)
 
+        word = "".join(word_parts)
         if word:
             yield word
 
+    @staticmethod
+    def split_on_whitespace(text: str) -> Sequence[str]:
+        """
+        Splits a text on runs of whitespace, like `re.split(r"\\s+", text)` does.
+        That is, leading and trailing whitespace give empty strings at the ends.
+        """
+        # note: `str.split` is much faster than a regex split, but drops leading and trailing whitespace.
+        items = text.split()
+        if not text or text[0].isspace():
+            items.insert(0, "")
+        if text[-1:].isspace():
+            items.append("")
+        return items
+
     @classmethod
     def prefix_lines(
         cls,
         lines: Iterable[str],
         first_line_prefix: str,
         following_line_prefix: Optional[str] = None,
-    ) -> Iterable[str]:
+    ) -> Sequence[str]:
         """
         Prepends a prefix string to a sequence of lines. The first line may
         have a different prefix from the following lines.
         """
-        following_line_prefix = following_line_prefix or first_line_prefix
-        is_first_line = True
-        for line in lines:
-            if is_first_line:
-                prefixed = first_line_prefix + line
-                is_first_line = False
-            else:
-                prefixed = following_line_prefix + line
-            yield prefixed if not prefixed.isspace() else ""
+        if not following_line_prefix or following_line_prefix == first_line_prefix:
+            # same prefix on all lines: no need to treat the first line separately.
+            # a prefixed line can only be blank if the prefix itself is blank.
+            if first_line_prefix and not first_line_prefix.isspace():
+                return [first_line_prefix + line for line in lines]
+            return [
+                first_line_prefix + line if line and not line.isspace() else ""
+                for line in lines
+            ]
+
+        lines = iter(lines)
+        first_line = next(lines, None)
+        if first_line is None:
+            return []
+        prefixed_lines = [first_line_prefix + first_line]
+        prefixed_lines.extend(following_line_prefix + line for line in lines)
+        return [line if not line.isspace() else "" for line in prefixed_lines]
 
     def table_row_to_text(self, row) -> Sequence[str]:
         """
         Renders each table cell on a table row to text. No word wrapping.
         """
-        return [next(self.span_to_lines(col.children, max_line_length=None), "") for col in row.children]
+        return [self.span_to_line(col.children) for col in row.children]
 
     @classmethod
     def calculate_table_column_widths(cls, col_text) -> Sequence[int]:
@@ -520,13 +609,11 @@ class MarkdownRenderer(BaseRenderer):
         Calculates column widths for a table.
         """
         MINIMUM_COLUMN_WIDTH = 3
-        col_widths = []
-        for row in col_text:
-            while len(col_widths) < len(row):
-                col_widths.append(MINIMUM_COLUMN_WIDTH)
-            for index, text in enumerate(row):
-                col_widths[index] = max(col_widths[index], len(text))
-        return col_widths
+        # transpose the rows into columns, so that each width is a single reduction
+        return [
+            max(MINIMUM_COLUMN_WIDTH, *map(len, column))
+            for column in zip_longest(*col_text, fillvalue="")
+        ]
 
     @classmethod
     def table_separator_line_to_text(cls, col_widths, col_align) -> Sequence[str]:
@@ -539,10 +626,11 @@ class MarkdownRenderer(BaseRenderer):
         separator_text = []
         for index, width in enumerate(col_widths):
             align = col_align[index] if index < len(col_align) else None
-            sep = ":" if align == 0 else "-"
-            sep += "-" * (width - 2)
-            sep += ":" if align == 0 or align == 1 else "-"
-            separator_text.append(sep)
+            separator_text.append(
+                (":" if align == 0 else "-")
+                + "-" * (width - 2)
+                + (":" if align == 0 or align == 1 else "-")
+            )
         return separator_text
 
     @classmethod
@@ -550,14 +638,38 @@ class MarkdownRenderer(BaseRenderer):
         """
         Pads/aligns the text for a table row and add the borders (pipe characters).
         """
-        padded_text = []
+        return cls.pad_table_row(col_text, cls.table_column_padders(col_widths, col_align))
+
+    @classmethod
+    def table_column_padders(cls, col_widths, col_align) -> Sequence[tuple]:
+        """
+        Resolves the padding of each column in a table, given column widths and alignments.
+        Returns `(pad_func, width)` pairs, where `pad_func(text, width)` pads/aligns a cell text.
+        """
+        col_padders = []
         for index, width in enumerate(col_widths):
-            text = col_text[index] if index < len(col_text) else ""
             align = col_align[index] if index < len(col_align) else None
             if align is None:
-                padded_text.append("{0: <{w}}".format(text, w=width))
+                col_padders.append((str.ljust, width))
             elif align == 0:
-                padded_text.append("{0: ^{w}}".format(text, w=width))
+                col_padders.append((cls._center, width))
             else:
-                padded_text.append("{0: >{w}}".format(text, w=width))
-        return "".join(("| ", " | ".join(padded_text), " |"))
+                col_padders.append((str.rjust, width))
+        return col_padders
+
+    @staticmethod
+    def pad_table_row(col_text, col_padders) -> str:
+        """
+        Pads/aligns the text for a table row using the padders from `table_column_padders`,
+        and add the borders (pipe characters).
+        """
+        padded_text = [
+            pad(text, width)
+            for (pad, width), text in zip(col_padders, chain(col_text, repeat("")))
+        ]
+        return "| " + " | ".join(padded_text) + " |"
+
+    @staticmethod
+    def _center(text: str, width: int) -> str:
+        # note: unlike `str.center`, any odd padding space always goes to the right.
+        return (" " * ((width - len(text)) // 2) + text).ljust(width)
@@ -88,7 +88,7 @@ class CoreTokens(SpanToken):
     precedence = 3
 
     def __new__(self, match):
-        return globals()[match.type](match)
+        return _core_token_types[match.type](match)
 
     @classmethod
     def find(cls, string):
@@ -241,7 +241,9 @@ class LineBreak(SpanToken):
         soft (bool): true if this is a soft line break.
     """
     repr_attributes = ("soft",)
-    pattern = re.compile(r'( *|\\)\n')
+    # note: the look-behind makes a run of spaces match only from its start,
+    # which keeps the search linear in the length of the run.
+    pattern = re.compile(r'((?<! ) *|\\)\n')
     parse_inner = False
     parse_group = 0
 
@@ -275,12 +277,12 @@ _tags = {'address', 'article', 'aside', 'base', 'basefont', 'blockquote',
 _tag   = r'[A-Za-z][A-Za-z0-9-]*'  # noqa: E221
 _attrs = r'(?:\s+[A-Za-z_:][A-Za-z0-9_.:-]*(?:\s*=\s*(?:[^\s"\'=<>`]+|\'[^\']*?\'|"[^\"]*?"))?)*'
 
-_open_tag    = r'(?<!\\)<' + _tag + _attrs + r'\s*/?>'  # noqa: E221
-_closing_tag = r'(?<!\\)</' + _tag + r'\s*>'
-_comment     = r'(?<!\\)<!--(?!>|->)(?:(?!--).)+?(?<!-)-->'  # noqa: E221
-_instruction = r'(?<!\\)<\?.+?\?>'
-_declaration = r'(?<!\\)<![A-Z].+?>'
-_cdata       = r'(?<!\\)<!\[CDATA.+?\]\]>'  # noqa: E221
+_open_tag    = r'<' + _tag + _attrs + r'\s*/?>'  # noqa: E221
+_closing_tag = r'</' + _tag + r'\s*>'
+_comment     = r'<!--(?!>|->)(?:(?!--).)+?(?<!-)-->'  # noqa: E221
+_instruction = r'<\?.+?\?>'
+_declaration = r'<![A-Z].+?>'
+_cdata       = r'<!\[CDATA.+?\]\]>'  # noqa: E221
 
 
 class HtmlSpan(SpanToken):
@@ -291,9 +293,12 @@ class HtmlSpan(SpanToken):
     Attributes:
         content (str): the raw HTML content.
     """
-    pattern = re.compile('|'.join([_open_tag, _closing_tag, _comment,
-                                   _instruction, _declaration, _cdata]),
-                                   re.DOTALL)
+    # note: the look-behind for a backslash escape is shared by all the alternatives,
+    # rather than repeated in each of them. this lets the regex engine skip quickly
+    # over text without any '<' in it.
+    pattern = re.compile(r'(?<!\\)(?:' + '|'.join([_open_tag, _closing_tag, _comment,
+                                                   _instruction, _declaration, _cdata]) + ')',
+                         re.DOTALL)
     parse_inner = False
     parse_group = 0
 
@@ -330,3 +335,8 @@ class XWikiBlockMacroEnd(SpanToken):
 
 _token_types = []
 reset_tokens()
+
+"""
+Core token classes by name, as referred to by core token matches.
+"""
+_core_token_types = {cls.__name__: cls for cls in (Strong, Emphasis, Image, Link)}
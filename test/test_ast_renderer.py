@@ -1,3 +1,4 @@
+import json
 import unittest
 from mistletoe import Document, ast_renderer
 
@@ -127,3 +128,17 @@ class TestAstRenderer(unittest.TestCase):
         }
         output = ast_renderer.get_ast(d)
         self.assertEqual(output, expected)
+
+    def test_render_matches_get_ast(self):
+        d = Document([
+            "# heading\n",
+            "\n",
+            "| A   | [link][ref] |\n",
+            "| --- | ----------- |\n",
+            "| 1   | 2           |\n",
+            "\n",
+            "[ref]: spam\n",
+        ])
+        with ast_renderer.AstRenderer() as renderer:
+            output = renderer.render(d)
+        self.assertEqual(output, json.dumps(ast_renderer.get_ast(d), indent=2) + '\n')
@@ -43,6 +43,15 @@ class TestCli(TestCase):
         mock_open_.assert_called_with(filename, 'r', encoding='utf-8')
         mock_write.assert_called_with('rendered text'.encode())
 
+    @patch('mistletoe.cli._write_chunk_size', 4)
+    @patch('mistletoe.markdown', return_value='rendered text')
+    @patch('sys.stdout.buffer.write')
+    @patch('builtins.open', new_callable=mock_open)
+    def test_convert_file_in_chunks(self, mock_open_, mock_write, mock_markdown):
+        cli.convert_file('foo', sentinel.RendererCls)
+        calls = [call(chunk.encode()) for chunk in ('rend', 'ered', ' tex', 't')]
+        self.assertEqual(mock_write.call_args_list, calls)
+
     @patch('builtins.open', side_effect=OSError)
     @patch('sys.exit')
     def test_convert_file_fail(self, mock_exit, mock_open_):
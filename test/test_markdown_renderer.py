@@ -282,6 +282,28 @@ class TestMarkdownRenderer(unittest.TestCase):
         output = self.roundtrip(input)
         self.assertEqual(output, "".join(input))
 
+    def test_empty_fenced_code_block(self):
+        input = [
+            "```\n",
+            "```\n",
+        ]
+        output = self.roundtrip(input)
+        self.assertEqual(output, "".join(input))
+
+    def test_fenced_code_block_at_end_of_input(self):
+        input = [
+            "```\n",
+            "code, not followed by a line break",
+        ]
+        output = self.roundtrip(input)
+        # note: the closing fence is always added.
+        expected = [
+            "```\n",
+            "code, not followed by a line break\n",
+            "```\n",
+        ]
+        self.assertEqual(output, "".join(expected))
+
     def test_blank_lines_following_code_block(self):
         input = [
             "    code block\n",
@@ -370,6 +392,21 @@ class TestMarkdownRenderer(unittest.TestCase):
         ]
         self.assertEqual(output, "".join(expected))
 
+    def test_table_with_centered_column(self):
+        input = [
+            "| ab | centered |\n",
+            "| :-: | :-: |\n",
+            "| x | y |\n",
+        ]
+        output = self.roundtrip(input)
+        # note: odd padding goes to the right of the centered text.
+        expected = [
+            "| ab  | centered |\n",
+            "| :-: | :------: |\n",
+            "|  x  |    y     |\n",
+        ]
+        self.assertEqual(output, "".join(expected))
+
     def test_direct_rendering_of_block_token(self):
         input = [
             "Line 1\n",
@@ -387,6 +424,26 @@ class TestMarkdownRenderer(unittest.TestCase):
             lines = renderer.render(raw_text)
         assert lines == input + "\n"
 
+    def test_render_map_replaced_in_subclass(self):
+        class CustomRenderer(MarkdownRenderer):
+            def __init__(self):
+                super().__init__()
+                self.render_map = dict(self.render_map, Paragraph=self.render_custom_paragraph)
+
+            def render_custom_paragraph(self, token, max_line_length):
+                return ["CUSTOM"]
+
+        with CustomRenderer() as renderer:
+            output = renderer.render(Document(["a\n"]))
+        self.assertEqual(output, "CUSTOM\n")
+
+    def test_render_map_changed_between_renderings(self):
+        with MarkdownRenderer() as renderer:
+            self.assertEqual(renderer.render(Document(["a\n"])), "a\n")
+            renderer.render_map["Paragraph"] = lambda token, max_line_length: ["REPLACED"]
+            output = renderer.render(Document(["a\n"]))
+        self.assertEqual(output, "REPLACED\n")
+
 
 class TestMarkdownFormatting(unittest.TestCase):
     def test_wordwrap_plain_paragraph(self):
@@ -182,6 +182,16 @@ class TestLineBreak(unittest.TestCase):
         self.assertIsInstance(token, span_token.LineBreak)
         self.assertFalse(token.soft)
 
+    def test_parse_hard_break_after_long_run_of_spaces(self):
+        raw_text, token, = span_token.tokenize_inner('a' + ' ' * 100000 + '\n')
+        self.assertEqual(raw_text.content, 'a')
+        self.assertIsInstance(token, span_token.LineBreak)
+        self.assertFalse(token.soft)
+
+    def test_parse_long_run_of_spaces_without_break(self):
+        token, = span_token.tokenize_inner('a' + ' ' * 100000 + 'b')
+        self.assertIsInstance(token, span_token.RawText)
+
 
 class TestContains(unittest.TestCase):
     def test_contains(self):
@@ -212,3 +222,7 @@ class TestHtmlSpan(unittest.TestCase):
         tokens = span_token.tokenize_inner('< a><\nfoo><bar/ >\n<foo bar=baz\nbim!bop />')
         for t in tokens:
             self.assertNotIsInstance(t, span_token.HtmlSpan)
+
+    def test_parse_escaped(self):
+        tokens = span_token.tokenize_inner('\\<a> \\</a> \\<!-- foo --> <b>')
+        self.assertEqual(['<b>'], [t.content for t in tokens if isinstance(t, span_token.HtmlSpan)])